@@ -23,8 +23,11 @@ python latest_build_installer.py general OB -c /home/user/Downloads -i /scr/user
 import time
 
 import argparse
+import concurrent.futures
 import datetime as DT
 import functools
+import importlib
+import json
 import logging
 import os
 import pickle
@@ -34,16 +37,53 @@ import shutil
 import subprocess
 import sys
 import tarfile
+import threading
 import zipfile
 
 from argparse import RawDescriptionHelpFormatter
-from bs4 import BeautifulSoup
 from contextlib import contextmanager
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from selectolax.parser import HTMLParser
+from urllib3.util.retry import Retry
+
+# Optional: decompress and unpack Darwin payloads in-process when available.
+# libarchive-c raises OSError or AttributeError rather than ImportError when
+# the libarchive C library itself can't be loaded
+try:
+    import libarchive
+    import rapidgzip
+except (ImportError, OSError, AttributeError):
+    libarchive = rapidgzip = None
 
 BASE_URL = 'http://build-download.schrodinger.com'
 
+# Size of each chunk read from the download stream (128 KiB)
+CHUNK_SIZE = 1024 * 128
+
+# Current release fetched from the calendar is reused for an hour
+RELEASE_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.lbi_release_cache.json')
+RELEASE_CACHE_TTL = 3600
+
+# Release given on the command line in YY-Q format
+_RELEASE_RE = re.compile(r'^2[0-9]-[1-4]$')
+# Mount point reported by "hdiutil attach -mountrandom /Volumes"
+_MOUNT_RE = re.compile(r'/Volumes/dmg\.\w+')
+
+# Number of build pages scraped concurrently when looking for a bundle
+SCRAPE_BATCH_SIZE = 4
+
+# Shared session so every request to the build server reuses one connection
+SESSION = requests.Session()
+SESSION.mount(
+    'http://',
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.3)))
+
 # Logger configuration
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
@@ -202,7 +242,7 @@ def parse_args():
 
     # Verify release argument is in correct format
     if args.release:
-        if not re.search('^[2][0-9]-[1-4]$', args.release):
+        if not _RELEASE_RE.match(args.release):
             parser.error('Incorrect release given')
         args.release = "20" + args.release
 
@@ -247,48 +287,143 @@ def download_file(url, target):
     :type target: str
     """
 
+    # skip the download if the previous installer matches the one on the
+    # server, going by its size and the ETag saved alongside it
+    etag_path = target + ".etag"
+    if os.path.exists(target) and _is_downloaded(url, target, etag_path):
+        logger.info(f"{target} already downloaded")
+        return
+
     # remove previous schrodinger installer if one already exists
     if os.path.exists(target):
         logger.info("Previous installer found, removing...")
         os.remove(target)
+    if os.path.exists(etag_path):
+        os.remove(etag_path)
 
     # Download file using the stream interface from requests
     # (avoids reading the entire file into memory)
     logger.info(f'Beginning download to {target}')
-    resp = requests.get(url, stream=True)
-    resp.raise_for_status()
+    with SESSION.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        total_size = int(resp.headers["Content-Length"])
+
+        # Copy the raw stream straight into the file and report progress
+        # from a separate thread so the copy loop stays in C
+        resp.raw.decode_content = True
+        with open(target, mode='wb') as file_handle:
+            done = threading.Event()
+            progress = threading.Thread(
+                target=_log_progress,
+                args=(file_handle, total_size, done),
+                daemon=True)
+            progress.start()
+            try:
+                shutil.copyfileobj(resp.raw, file_handle, length=CHUNK_SIZE)
+            finally:
+                done.set()
+                progress.join()
+        etag = resp.headers.get("ETag")
+
+    if etag:
+        with open(etag_path, 'w') as fh:
+            fh.write(etag)
+    logger.info('Download complete')
 
-    total_size = int(resp.headers["Content-Length"]) / 1024 / 1024
-    chunk_size_mb = 50
 
-    with open(target, mode='wb') as file_handle:
-        downloaded_size = int(0)
-        for chunk in resp.iter_content(chunk_size=1024 * 1024 * chunk_size_mb):
-            if not chunk:
-                # Filter out keep-alive chunks
-                continue
-            downloaded_size += len(chunk) / 1024 / 1024
-            percent = min((float(downloaded_size) / total_size) * 100, 100)
-            dl_logger.info(
-                f'{downloaded_size:4}/{total_size} MB {percent :>6.2f}%')
-            file_handle.write(chunk)
-    logger.info('Download complete')
+def _is_downloaded(url, target, etag_path):
+    """
+    Checks whether a previous download matches the file on the server. Any
+    failure to tell counts as a mismatch, so the file is downloaded again.
 
+    :param url: URL the file was downloaded from
+    :type url: str
+    :param target: Path to the previous download
+    :type target: str
+    :param etag_path: Path to the ETag saved with the previous download
+    :type etag_path: str
+
+    :return downloaded: Whether the previous download is up to date
+    :rtype downloaded: bool
+    """
+
+    try:
+        head = SESSION.head(url)
+        head.raise_for_status()
+        etag = head.headers["ETag"]
+        size = int(head.headers["Content-Length"])
+    except (requests.RequestException, KeyError, ValueError):
+        return False
+
+    return (os.path.getsize(target) == size and
+            _read_etag(etag_path) == etag)
 
+
+def _read_etag(etag_path):
+    """
+    Reads the ETag saved next to a previous download.
+
+    :param etag_path: Path to the ETag file
+    :type etag_path: str
+
+    :return etag: The saved ETag, or None if there isn't one
+    :rtype etag: str
+    """
+
+    try:
+        with open(etag_path, 'r') as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def _log_progress(file_handle, total_size, done, interval=1.0):
+    """
+    Log the progress of a download once per interval until done is set.
+
+    :param file_handle: File object the download is being written to or
+        read from
+    :type file_handle: file object
+    :param total_size: Expected size of the download in bytes
+    :type total_size: int
+    :param done: Event that is set once the download has finished
+    :type done: threading.Event
+    :param interval: Number of seconds between each log line
+    :type interval: float
+    """
+
+    total_size_mb = total_size // (1024 * 1024)
+
+    # Schedule against a fixed clock so slow log writes don't cause drift
+    next_log_time = time.monotonic() + interval
+    while not done.wait(max(next_log_time - time.monotonic(), 0)):
+        next_log_time += interval
+        downloaded_size = file_handle.tell()
+        percent = min(downloaded_size * 100 // total_size, 100)
+        dl_logger.info(
+            f'{downloaded_size // (1024 * 1024):4}/{total_size_mb} MB {percent:>3}%'
+        )
+
+
+@functools.lru_cache(maxsize=1)
 @logged
 def get_current_release(token_path):
     """
     Gets the current release version by looking 15 weeks ahead
     from the time of execution into the build & release calendar
-    and examining the next release target.
+    and examining the next release target. The result is cached in
+    RELEASE_CACHE_PATH for RELEASE_CACHE_TTL seconds.
 
     :return current_release: Current release in XXXX-X format
     :rtype current_release: str
     """
 
-    from googleapiclient.discovery import build
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
+    cached_release = _read_release_cache()
+    if cached_release:
+        logger.info(f"Using cached release {cached_release}")
+        return cached_release
+
+    build, InstalledAppFlow, Request = _lazy_google()
 
     SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
     QA_calendar_id = "schrodinger.com_cl2hf12t7dim7s894gda2l9pa0@group.calendar.google.com"
@@ -338,9 +473,102 @@ def get_current_release(token_path):
         logger.info("No release targets detected")
         return False
 
+    _write_release_cache(current_release)
+
     return current_release
 
 
+@functools.lru_cache(maxsize=1)
+def _lazy_google():
+    """
+    Imports the google API modules on first use. They are deliberately not
+    imported at module level since they take hundreds of ms to load and
+    aren't needed when the release is given with -r.
+
+    :return: googleapiclient's build, InstalledAppFlow and Request
+    :rtype: tuple
+    """
+
+    discovery = importlib.import_module('googleapiclient.discovery')
+    flow = importlib.import_module('google_auth_oauthlib.flow')
+    transport = importlib.import_module('google.auth.transport.requests')
+    return discovery.build, flow.InstalledAppFlow, transport.Request
+
+
+def _read_release_cache():
+    """
+    Reads the release from the release cache file.
+
+    :return release: Cached release in XXXX-X format, or None if there is no
+        cache or it has expired
+    :rtype release: str
+    """
+
+    try:
+        with open(RELEASE_CACHE_PATH, 'r') as fh:
+            cache = json.load(fh)
+        if time.time() - cache["fetched_at"] < RELEASE_CACHE_TTL:
+            return cache["release"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_release_cache(release):
+    """
+    Writes the release to the release cache file.
+
+    :param release: Release in XXXX-X format
+    :type release: str
+    """
+
+    try:
+        with open(RELEASE_CACHE_PATH, 'w') as fh:
+            json.dump({"release": release, "fetched_at": time.time()}, fh)
+    except OSError as err:
+        logger.info(f"Unable to write release cache: {err}")
+
+
+@logged
+def download_and_extract_bundle(url, destination):
+    """
+    Extract a tar bundle into the specified directory as it's being
+    downloaded, without saving the bundle to disk. The top-level directory of
+    the bundle is stripped so files land directly in the destination.
+
+    :param url: URL to download the tar bundle from
+    :type url: str
+    :param destination: Target directory for extracting files.
+    :type destination: str
+    """
+
+    logger.info(f'Extracting {url} to {destination} as it downloads')
+    with SESSION.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        total_size = int(resp.headers["Content-Length"])
+
+        resp.raw.decode_content = True
+        done = threading.Event()
+        progress = threading.Thread(
+            target=_log_progress,
+            args=(resp.raw, total_size, done),
+            daemon=True)
+        progress.start()
+        try:
+            bsdtar = shutil.which('bsdtar')
+            if bsdtar:
+                _bsdtar_extract_stream(bsdtar, resp.raw, destination)
+            else:
+                with tarfile.open(fileobj=resp.raw, mode='r|') as tar:
+                    tar.extractall(
+                        path=destination,
+                        members=(m for m in tar if _strip_top_level_dir(m)))
+        finally:
+            done.set()
+            progress.join()
+    logger.info('Download and extraction complete')
+
+
 @logged
 def extract_bundle(bundle_path, destination):
     """
@@ -358,8 +586,14 @@ def extract_bundle(bundle_path, destination):
         with zipfile.ZipFile(bundle_path, 'r') as zip_archive:
             zip_archive.extractall(path=destination)
     elif sys.platform.startswith('linux'):
-        with tarfile.open(name=bundle_path, mode='r') as tar:
-            tar.extractall(path=destination)
+        # bsdtar extracts much faster than tarfile when it's available
+        bsdtar = shutil.which('bsdtar')
+        if bsdtar:
+            subprocess.check_call(
+                _get_bsdtar_cmd(bsdtar, bundle_path, destination))
+        else:
+            _extract_tar(bundle_path, destination)
+        return
     elif sys.platform.startswith('darwin'):
         with mount_dmg(bundle_path) as mount_point:
             bundle_name = os.path.basename(bundle_path)
@@ -370,33 +604,163 @@ def extract_bundle(bundle_path, destination):
     else:
         raise RuntimeError(f'Unsupported platform: {sys.platform}')
 
-    # For tar and zip, extracted files go in a subdir and need to be moved to
+    # For zip, extracted files go in a subdir and need to be moved to
     # the destination directory
     dirname = os.path.join(destination,
                            os.path.splitext(os.path.basename(bundle_path))[0])
+    # A plain rename is enough when both are on the same device, otherwise
+    # shutil.move has to copy the files across
+    same_device = os.stat(dirname).st_dev == os.stat(destination).st_dev
     try:
-        for name in os.listdir(dirname):
-            src = os.path.join(dirname, name)
-            logger.info(f"Moving {os.path.abspath(src)} to {destination}")
-            shutil.move(src, destination)
+        with os.scandir(dirname) as entries:
+            for entry in entries:
+                logger.info(
+                    f"Moving {os.path.abspath(entry.path)} to {destination}")
+                if same_device:
+                    os.rename(entry.path,
+                              os.path.join(destination, entry.name))
+                else:
+                    shutil.move(entry.path, destination)
     finally:
         shutil.rmtree(dirname)
 
 
+def _get_bsdtar_cmd(bsdtar, archive, destination):
+    """
+    Builds the bsdtar command that extracts an archive into the destination
+    directory, stripping the top-level directory of the bundle.
+
+    :param bsdtar: Path to the bsdtar executable.
+    :type bsdtar: str
+    :param archive: Path to the archive, or '-' to read it from stdin.
+    :type archive: str
+    :param destination: Target directory for extracting files.
+    :type destination: str
+    """
+
+    return [
+        bsdtar, '-xf', archive, '-C', destination, '--strip-components=1'
+    ]
+
+
+def _bsdtar_extract_stream(bsdtar, stream, destination):
+    """
+    Extracts a tar bundle read from a file object by piping it into bsdtar.
+
+    :param bsdtar: Path to the bsdtar executable.
+    :type bsdtar: str
+    :param stream: File object the tar bundle is read from.
+    :type stream: file object
+    :param destination: Target directory for extracting files.
+    :type destination: str
+    """
+
+    cmd = _get_bsdtar_cmd(bsdtar, '-', destination)
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE, bufsize=0) as proc:
+        try:
+            shutil.copyfileobj(stream, proc.stdin, length=CHUNK_SIZE)
+        except BrokenPipeError:
+            # bsdtar exited early, its return code is checked below
+            pass
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _extract_tar(bundle_path, destination):
+    """
+    Extract a tar bundle into the specified directory using a pool of
+    workers. The top-level directory of the bundle is stripped so files land
+    directly in the destination directory.
+
+    :param bundle_path: Path to tar bundle being extracted.
+    :type bundle_path: str
+    :param destination: Target directory for extracting files.
+    :type destination: str
+    """
+
+    with tarfile.open(name=bundle_path, mode='r') as tar:
+        members = [m for m in tar.getmembers() if _strip_top_level_dir(m)]
+        dirs = [m for m in members if m.isdir()]
+        hard_links = [m for m in members if m.islnk()]
+        files = [m for m in members if not m.isdir() and not m.islnk()]
+
+        # Create the directory tree up front so workers never race on it
+        for member in files:
+            parent = os.path.dirname(member.name)
+            if parent:
+                os.makedirs(os.path.join(destination, parent), exist_ok=True)
+
+        # tarfile handles aren't thread safe, so each worker opens its own
+        workers = min(os.cpu_count() or 1, len(files)) or 1
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers) as executor:
+            futures = [
+                executor.submit(_extract_tar_members, bundle_path,
+                                files[i::workers], destination)
+                for i in range(workers)
+            ]
+            for future in futures:
+                future.result()
+
+        # Hard links need their targets in place, and directory permissions
+        # and times are set last so extracting their contents doesn't
+        # clobber them
+        for member in hard_links:
+            tar.extract(member, path=destination)
+        for member in sorted(dirs, key=lambda m: m.name, reverse=True):
+            tar.extract(member, path=destination)
+
+
+def _extract_tar_members(bundle_path, members, destination):
+    """
+    Extract the given members of a tar bundle using a dedicated handle.
+
+    :param bundle_path: Path to tar bundle being extracted.
+    :type bundle_path: str
+    :param members: Members of the bundle to extract.
+    :type members: list(tarfile.TarInfo)
+    :param destination: Target directory for extracting files.
+    :type destination: str
+    """
+
+    with tarfile.open(name=bundle_path, mode='r') as tar:
+        for member in members:
+            tar.extract(member, path=destination)
+
+
+def _strip_top_level_dir(member):
+    """
+    Removes the leading directory component from a tar member's name (and
+    the link target of hard links) in place.
+
+    :param member: Tar member to modify.
+    :type member: tarfile.TarInfo
+
+    :return: False if nothing remains after stripping (the top-level
+        directory itself), True otherwise
+    :rtype: bool
+    """
+
+    name = member.name.lstrip('/').split('/', 1)
+    if len(name) == 1 or not name[1]:
+        return False
+    member.name = name[1]
+
+    if member.islnk():
+        member.linkname = member.linkname.lstrip('/').split('/', 1)[-1]
+
+    return True
+
+
 @logged
 def format_buildID(build_id):
     # modify latest_build so that "build-###" becomes "Build ###"
     format1 = build_id.capitalize().replace("-", " ")
 
     # modify latest_build so that "build-0##" becomes "Build ##"
-    formatted_buildID = ""
+    formatted_buildID = format1
     if int(format1[6]) == 0:
-        for i in range(len(build_id)):
-            if i != 6:
-                formatted_buildID = formatted_buildID + format1[i]
-
-    if formatted_buildID == "":
-        formatted_buildID = format1
+        formatted_buildID = format1[:6] + format1[7:]
 
     return formatted_buildID
 
@@ -432,32 +796,44 @@ def get_build_info(release, build_type, bundle_type, knime):
 
     # update URL and navigate to builds page
     URL = '/'.join([BASE_URL, build_type, release])
-    page = requests.get(URL)
-    soup = BeautifulSoup(page.content, 'html.parser')
+    page = SESSION.get(URL)
+    tree = HTMLParser(page.text)
 
     # obtain all available builds and arrange the latest build first
-    all_uls = soup.find_all('ul')
-    builds_list = all_uls[1].text.split('\n')
+    all_uls = tree.css('ul')
+    builds_list = all_uls[1].text().split('\n')
     builds_list = [id.strip() for id in builds_list if 'build' in id]
 
     if int(builds_list[-1][6:9]) > int(builds_list[0][6:9]):
         builds_list = builds_list[::-1]
 
-    # go through each build-id page (starting with the latest) and find
-    # the latest build id. Stop once and available bundle is found
+    # go through the build-id pages (starting with the latest) a batch at a
+    # time and find the latest build id. Stop once an available bundle is
+    # found
     logger.info(
         f"Finding the latest available {bundle_type} build for {platform}...")
-    for build_page in builds_list:
-        bundle_name = get_bundle_name(release, build_type, build_page,
-                                      bundle_type, platform, knime)
-        latest_build = build_page
-        if bundle_name:
+
+    def find_bundle(build_page):
+        return get_bundle_name(release, build_type, build_page, bundle_type,
+                               platform, knime)
+
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=SCRAPE_BATCH_SIZE) as executor:
+        for start in range(0, len(builds_list), SCRAPE_BATCH_SIZE):
+            batch = builds_list[start:start + SCRAPE_BATCH_SIZE]
+            for latest_build, bundle_name in zip(
+                    batch, executor.map(find_bundle, batch)):
+                if bundle_name:
+                    break
+            else:
+                continue
             break
     logger.info(f"Latest {bundle_type} build for {platform} is {latest_build}")
 
     return latest_build, bundle_name
 
 
+@functools.lru_cache(maxsize=64)
 @logged
 def get_bundle_name(release, build_type, build_page, bundle_type, platform,
                     knime):
@@ -477,9 +853,9 @@ def get_bundle_name(release, build_type, build_page, bundle_type, platform,
     """
 
     URL = '/'.join([BASE_URL, build_type, release, build_page])
-    page = requests.get(URL)
+    page = SESSION.get(URL)
     page.raise_for_status()
-    soup = BeautifulSoup(page.content, 'html.parser')
+    tree = HTMLParser(page.text)
 
     # find the appropriate bundle type header and go to the ul under it.
     header = bundle_type.capitalize()
@@ -487,10 +863,11 @@ def get_bundle_name(release, build_type, build_page, bundle_type, platform,
         header = "Academic"
 
     # For the rare occasion that headers aren't updated on the build site
-    try:
-        bundle_type_header = soup.find('h3', text=f'{header} Installers')
-        installers = bundle_type_header.find_next_sibling()
-    except AttributeError:
+    bundle_type_header = next(
+        (h3 for h3 in tree.css('h3') if h3.text() == f'{header} Installers'),
+        None)
+    installers = _next_element_sibling(bundle_type_header)
+    if installers is None:
         logger.info(
             f"No {bundle_type} installers found for {URL}, moving to next build"
         )
@@ -500,8 +877,7 @@ def get_bundle_name(release, build_type, build_page, bundle_type, platform,
     filter_ = platform
     if bundle_type.lower() == "desres":
         filter_ = "DESRES"
-    installers = installers.find_all(
-        lambda tag: (tag.name == 'a' and filter_ in tag.text))
+    installers = [a for a in installers.css('a') if filter_ in a.text()]
 
     # See if there is an available installer
     if len(installers) == 0:
@@ -517,12 +893,30 @@ def get_bundle_name(release, build_type, build_page, bundle_type, platform,
 
     installer_file = ""
     if installer:
-        installer_file = installer['href']
+        installer_file = installer.attributes['href']
         installer_file = installer_file.split('/')[-1]
 
     return installer_file
 
 
+def _next_element_sibling(node):
+    """
+    Finds the next sibling of a node that is an element, skipping over text
+    and comment nodes.
+
+    :param node: Node to start from, may be None
+    :type node: selectolax.parser.Node
+
+    :return: The next element sibling or None if there isn't one
+    :rtype: selectolax.parser.Node
+    """
+
+    sibling = node.next if node is not None else None
+    while sibling is not None and sibling.tag in ('-text', '_comment'):
+        sibling = sibling.next
+    return sibling
+
+
 @logged
 def get_local_build_version(local_installation_path):
     """
@@ -544,10 +938,27 @@ def get_local_build_version(local_installation_path):
 
 
 @logged
-def install_schrodinger_bundle(release, bundle_installer, local_install_dir):
+def install_schrodinger_bundle(release,
+                               bundle_installer,
+                               local_install_dir,
+                               bundle_url=None):
+    """
+    Extracts and installs the bundle into the local installation directory.
+
+    :param bundle_installer: Path to the downloaded bundle. Ignored if
+        bundle_url is given.
+    :type bundle_installer: str
+    :param bundle_url: URL of a tar bundle to extract while it downloads
+        instead of reading bundle_installer.
+    :type bundle_url: str
+    """
+
     install_tmpdir = os.path.join(local_install_dir, "install_tmpdir")
     create_clean_dirs(install_tmpdir)
-    extract_bundle(bundle_installer, install_tmpdir)
+    if bundle_url:
+        download_and_extract_bundle(bundle_url, install_tmpdir)
+    else:
+        extract_bundle(bundle_installer, install_tmpdir)
 
     if sys.platform.startswith('win32'):
         cmd = _get_windows_install_cmd(install_tmpdir, local_install_dir)
@@ -577,7 +988,12 @@ def _run_install_cmd(cmd, cwd):
     logger.info(f'Running {subprocess.list2cmdline(cmd)}')
     env = os.environ.copy()
     env['SCHRODINGER_INSTALL_UNSUPPORTED_PLATFORMS'] = '1'
-    subprocess.check_call(cmd, cwd=cwd, stderr=subprocess.STDOUT, env=env)
+    subprocess.check_call(
+        cmd,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stderr=subprocess.STDOUT,
+        env=env)
 
 
 def _get_windows_install_cmd(installer_dir, target_dir):
@@ -616,21 +1032,24 @@ def _darwin_install(release, installer_dir, target_dir):
     #create_clean_dirs(app_dir)
     target_dir = target_dir + "/"
 
-    for file_path in os.listdir(installer_dir):
-        if os.path.splitext(file_path)[1] != '.pkg':
-            continue
-        payload = os.path.join(file_path, 'Payload')
-        logger.info(f'Extracting payload from {payload}')
-        # Equivalent of "gunzip -c $payload | cpio -i"
-        gunzip_cmd = ['gunzip', '-c', payload]
-        gunzip = subprocess.Popen(
-            gunzip_cmd, cwd=installer_dir, stdout=subprocess.PIPE)
-        subprocess.check_call(
-            ['cpio', '-i'], cwd=target_dir, stdin=gunzip.stdout)
-        gunzip.wait()
-        if gunzip.returncode != 0:
-            raise subprocess.CalledProcessError(
-                gunzip.returncode, gunzip_cmd, output=gunzip.stdout)
+    pkgs = [
+        file_path for file_path in os.listdir(installer_dir)
+        if os.path.splitext(file_path)[1] == '.pkg'
+    ]
+    if not pkgs:
+        return
+
+    # Each pkg is independent, so extract their payloads concurrently.
+    # Output is buffered per pkg and logged in order to avoid interleaving.
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, len(pkgs))) as executor:
+        futures = [
+            executor.submit(_extract_payload, installer_dir, pkg, target_dir)
+            for pkg in pkgs
+        ]
+        for pkg, future in zip(pkgs, futures):
+            output = future.result()
+            logger.info(f'Extracted payload from {pkg}\n{output}')
 
     # move .app files to /Applications/
     #for file_ in os.listdir(target_dir):
@@ -639,6 +1058,98 @@ def _darwin_install(release, installer_dir, target_dir):
     #    shutil.move((target_dir + file_), app_dir)
 
 
+def _extract_payload(installer_dir, pkg, target_dir):
+    """
+    Extracts the "Payload" of a single pkg file into the target directory.
+
+    :param installer_dir: Path to directory containing pkg files.
+    :type installer_dir: str
+    :param pkg: Name of the pkg file in installer_dir.
+    :type pkg: str
+    :param target_dir: Path to installation target directory.
+    :type target_dir: str
+
+    :return output: Combined output of gunzip and cpio
+    :rtype output: str
+    """
+
+    payload = os.path.join(pkg, 'Payload')
+    if libarchive and rapidgzip:
+        _extract_payload_in_process(
+            os.path.join(installer_dir, payload), target_dir)
+        return ''
+
+    # Equivalent of "gunzip -c $payload | cpio -i"
+    gunzip_cmd = ['gunzip', '-c', payload]
+    cpio_cmd = ['cpio', '-i']
+    gunzip = subprocess.Popen(
+        gunzip_cmd,
+        cwd=installer_dir,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE)
+    cpio = subprocess.Popen(
+        cpio_cmd,
+        cwd=target_dir,
+        stdin=gunzip.stdout,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True)
+    # Only cpio should hold the read end of the pipe, so gunzip gets EPIPE
+    # if cpio exits early instead of blocking forever
+    gunzip.stdout.close()
+    cpio_out, _ = cpio.communicate()
+    gunzip_err = gunzip.stderr.read().decode(errors='replace')
+    gunzip.stderr.close()
+    gunzip.wait()
+    if cpio.returncode != 0:
+        raise subprocess.CalledProcessError(
+            cpio.returncode, cpio_cmd, output=cpio_out)
+    if gunzip.returncode != 0:
+        raise subprocess.CalledProcessError(
+            gunzip.returncode, gunzip_cmd, output=gunzip_err)
+
+    return gunzip_err + cpio_out
+
+
+def _extract_payload_in_process(payload, target_dir):
+    """
+    Extracts a gzipped cpio payload without spawning gunzip and cpio.
+    rapidgzip decompresses the stream in parallel and libarchive unpacks
+    the cpio entries into the target directory.
+
+    :param payload: Path to the Payload file.
+    :type payload: str
+    :param target_dir: Path to installation target directory.
+    :type target_dir: str
+    """
+
+    # Symlinks in the target path itself (eg /tmp -> /private/tmp) would be
+    # refused by EXTRACT_SECURE_SYMLINKS, so resolve them first
+    real_target_dir = os.path.realpath(target_dir)
+
+    def rebase(entries):
+        # libarchive extracts relative to the CWD, which is shared by all
+        # threads, so point every entry (and hard link target) at the target
+        # directory instead
+        for entry in entries:
+            entry.pathname = os.path.join(real_target_dir, entry.pathname)
+            if entry.islnk:
+                entry.linkpath = os.path.join(real_target_dir, entry.linkpath)
+            yield entry
+
+    # The rebased paths are absolute, so libarchive's default of refusing
+    # absolute paths can't be used. ".." and writing through symlinks are
+    # still refused
+    flags = (libarchive.extract.EXTRACT_SECURE_NODOTDOT
+             | libarchive.extract.EXTRACT_SECURE_SYMLINKS
+             | libarchive.extract.EXTRACT_PERM
+             | libarchive.extract.EXTRACT_TIME)
+    with rapidgzip.open(payload, parallelization=os.cpu_count()) as gz, \
+            libarchive.stream_reader(gz, format_name='cpio') as archive:
+        libarchive.extract.extract_entries(rebase(archive), flags=flags)
+
+
 @logged
 def install_license_stub(installation_dir):
     """
@@ -649,12 +1160,13 @@ def install_license_stub(installation_dir):
     create_clean_dirs(license_dir)
     current_date = DT.datetime.now().strftime("%Y-%m-%d")
     lic_filename = f"80_client_{current_date}_pdx-lic-lv01.lic"
+    lic_path = os.path.join(license_dir, lic_filename)
+    tmp_path = lic_path + ".tmp"
 
-    with open(lic_filename, "w+") as new_lic:
+    with open(tmp_path, "w") as new_lic:
         lic_contents = ["SERVER pdx-lic-lv01 ANY 27008\n", "USE_SERVER"]
         new_lic.writelines(lic_contents)
-
-    shutil.move(lic_filename, license_dir)
+    os.replace(tmp_path, lic_path)
 
     logger.info("License successfully installed")
 
@@ -672,22 +1184,21 @@ def install_schrodinger_hosts(build_type, release, build_id, installation_dir):
         "release": release,
         "build_id": build_id
     }
-    resp = requests.post(url, data=form_data, stream=True)
-    resp.raise_for_status()
-
-    with open("schrodinger.hosts", mode='w') as host_file:
-        host_file.write(resp.text)
-
     hosts_path = os.path.join(installation_dir, "schrodinger.hosts")
-
-    # remove stock schrodinger.hosts file if one exists
-    if os.path.isfile(hosts_path):
-        os.remove(hosts_path)
+    tmp_path = hosts_path + ".tmp"
 
     logger.info("Installing schrodinger.hosts...")
-    shutil.move("schrodinger.hosts", installation_dir)
+    with SESSION.post(url, data=form_data, stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        with open(tmp_path, mode='wb') as host_file:
+            shutil.copyfileobj(resp.raw, host_file)
+
     logger.info("Setting permissions for schrodinger.hosts...")
-    os.chmod(hosts_path, 0o776)
+    os.chmod(tmp_path, 0o776)
+
+    # atomically replaces the stock schrodinger.hosts file if one exists
+    os.replace(tmp_path, hosts_path)
     logger.info("Schroding.hosts successfully installed")
 
 
@@ -704,7 +1215,7 @@ def mount_dmg(dmg_path):
 
     logger.info(output)
 
-    match = re.search(r'/Volumes/dmg\.[\d\w]+', output)
+    match = _MOUNT_RE.search(output)
     if not match:
         raise RuntimeError(
             f'Could not parse mount point\n\nCommand: {subprocess.list2cmdline(cmd)}\n\nOutput:\n\n{output}'
@@ -724,7 +1235,8 @@ def mount_dmg(dmg_path):
 def uninstall(release, installation_dir):
     if sys.platform.startswith('win32'):
         uninstaller = f"{installation_dir}\\installer\\uninstall-silent.exe"
-        subprocess.run([uninstaller, "/interactive_mode:off", "/cleanall"])
+        subprocess.run([uninstaller, "/interactive_mode:off", "/cleanall"],
+                       stdin=subprocess.DEVNULL)
 
         # sleep is needed or else clean_dirs from 463 doesn't work in install_schrodinger()
         # TODO figure out why
@@ -782,9 +1294,14 @@ def main(*,
     if download_dest:
         bundle_path = os.path.join(download_dest, bundle_name)
 
-    logger.info(
-        f"Download directory used: {user_down_dir}\nInstallation directory used: {local_install_dir}"
-    )
+    # Linux bundles are tars, which can be extracted as they download unless
+    # the bundle itself is wanted on disk
+    stream_extract = (sys.platform.startswith('linux') and not download_only
+                      and not download_dest)
+    if not stream_extract:
+        logger.info(
+            f"Download directory used: {os.path.dirname(bundle_path)}")
+    logger.info(f"Installation directory used: {local_install_dir}")
 
     logger.info(f"Checking for a local {release} installation...")
     if os.path.isdir(local_install_dir):
@@ -802,12 +1319,16 @@ def main(*,
     else:
         logger.info("No local installation found.")
 
-    download_file(download_url, bundle_path)
-    if download_only:
-        logger.info("Download-only enabled, stopping execution")
-        return
+    if stream_extract:
+        install_schrodinger_bundle(
+            release, bundle_path, local_install_dir, bundle_url=download_url)
+    else:
+        download_file(download_url, bundle_path)
+        if download_only:
+            logger.info("Download-only enabled, stopping execution")
+            return
 
-    install_schrodinger_bundle(release, bundle_path, local_install_dir)
+        install_schrodinger_bundle(release, bundle_path, local_install_dir)
     install_schrodinger_hosts(build_type, release, latest_build,
                               local_install_dir)
     install_license_stub(local_install_dir)
@@ -3,7 +3,9 @@ Script designed to automate the process of download testing when
 given a bundle type and release version. This script has the
 following requirements:
 
-1. Must have chrome browser installed and chromedriver somewhere in your $PATH
+1. Bundles are downloaded by submitting the download form directly. If that
+fails, chrome is used instead, which requires chrome browser installed and
+chromedriver somewhere in your $PATH
 (To install chromedriver, run script and see link in error message)
 
 2. Run on Linux or Mac
@@ -15,23 +17,85 @@ example usages:
     python3 download_tester.py academic 21-1 -manual
 """
 import argparse
+import concurrent.futures
 import hashlib
+import json
 import logging
+import logging.handlers
+import mmap
 import os
+import queue
 import re
 import requests
+import threading
 import time
 
 from argparse import RawDescriptionHelpFormatter
+from html.parser import HTMLParser
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.keys import Keys
+from urllib.parse import urljoin
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
 
 
 TIMEOUT = 6000
+# Seconds to wait for elements to appear on the download pages
+PAGE_TIMEOUT = 30
+# Size of each read when calculating checksums (1 MiB)
+CHECKSUM_CHUNK = 1 << 20
+# Bundles up to this size are hashed from a memory map (2 GiB)
+MMAP_MAX_SIZE = 2 << 30
+# Extension of the reference checksum files for each hash algorithm
+CHECKSUM_EXTENSIONS = {"md5": ".md5", "blake3": ".b3"}
+# Reference checksums are cached here and revalidated after a day
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "download_tester")
+CACHE_TTL = 86400
 URL = "https://schrodinger-staging.metaltoad-sites.com/downloads/releases"
 ACADEMIC_URL = "https://schrodinger-staging.metaltoad-sites.com/freemaestro/"
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+# Release in YY-Q format and NB build id given on the command line
+_RELEASE_RE = re.compile(r'^2[0-9]-[1-4]$')
+_BUILD_RE = re.compile(r'^[0-9]{3}$')
+
+# Platforms each bundle type is downloaded for
+PLATFORMS = {
+    "academic": ("Linux-x86_64", "Windows-x64", "MacOSX"),
+    "advanced": ("Linux-x86_64", "Windows-x64", "MacOSX", "KNIME_MacOSX"),
+    "commercial": ("Linux-x86_64", "Windows-x64", "MacOSX", "KNIME_MacOSX"),
+    "non-commercial": ("Linux-x86_64", "Windows-x64", "MacOSX",
+                       "KNIME_MacOSX"),
+}
+
+# Bundle file name for each bundle type and platform
+_NAME_TMPL = {
+    ("academic", "Linux-x86_64"): "Maestro_20{rel}_Linux-x86_64_Academic.tar",
+    ("academic", "Windows-x64"): "Maestro_20{rel}_Windows-x64_Academic.zip",
+    ("academic", "MacOSX"): "Maestro_20{rel}_MacOSX_Academic.dmg",
+    ("advanced", "Linux-x86_64"): "Schrodinger_Suites_20{rel}_Advanced_Linux-x86_64.tar",
+    ("advanced", "Windows-x64"): "Schrodinger_Suites_20{rel}_Advanced_Windows-x64.zip",
+    ("advanced", "MacOSX"): "Schrodinger_Suites_20{rel}_Advanced_MacOSX.dmg",
+    ("advanced", "KNIME_MacOSX"): "Schrodinger_Suites_20{rel}_Advanced_KNIME_MacOSX.dmg",
+    ("commercial", "Linux-x86_64"): "Schrodinger_Suites_20{rel}_Linux-x86_64.tar",
+    ("commercial", "Windows-x64"): "Schrodinger_Suites_20{rel}_Windows-x64.zip",
+    ("commercial", "MacOSX"): "Schrodinger_Suites_20{rel}_MacOSX.dmg",
+    ("commercial", "KNIME_MacOSX"): "Schrodinger_Suites_20{rel}_KNIME_MacOSX.dmg",
+    ("non-commercial", "Linux-x86_64"): "Schrodinger_Suites_20{rel}_Linux-x86_64.tar",
+    ("non-commercial", "Windows-x64"): "Schrodinger_Suites_20{rel}_Windows-x64.zip",
+    ("non-commercial", "MacOSX"): "Schrodinger_Suites_20{rel}_MacOSX.dmg",
+    ("non-commercial", "KNIME_MacOSX"): "Schrodinger_Suites_20{rel}_KNIME_MacOSX.dmg",
+}
+
 LOGIN_CREDENTIALS = {
     "non-commercial": {
         "user": "academic@schrodinger.com",
@@ -85,10 +149,17 @@ def parse_args():
         action="store_true",
         default=False)
 
+    parser.add_argument(
+        "-hash",
+        help="hash algorithm used to verify the bundles (blake3 requires the "
+        "blake3 package)",
+        choices=list(CHECKSUM_EXTENSIONS),
+        default="md5")
+
     args = parser.parse_args()
 
     # Verify release argument is in correct format
-    if not re.search('^[2][0-9]-[1-4]$', args.release):
+    if not _RELEASE_RE.match(args.release):
         parser.error('Incorrect release given')
 
     # require -build_id or -manual to be passed
@@ -99,23 +170,229 @@ def parse_args():
             'You can only supply one of the following arguments: -build_id, -manual')
 
     # Verify -build_id argument is in correct format
-    if args.build_id and not re.search('^[0-9][0-9][0-9]$', args.build_id):
+    if args.build_id and not _BUILD_RE.match(args.build_id):
         parser.error('Improper build format given')
 
     return args
 
 
 
-def download_all_bundles(driver, bundle_type, release):
-    for platform_id in ["edit-linux", "edit-windows-64-bit", "edit-mac"]:
-        download_bundle(driver, bundle_type, platform_id, "without KNIME")
+def get_bundle_downloads(bundle_type):
+    """
+    Lists how each bundle is selected on the download form.
+
+    :return downloads: platform element id, mac version, and platform of
+        each bundle in the same order as download_files_builder()
+    :rtype downloads: list
+    """
+    downloads = [("edit-linux", "without KNIME", "Linux-x86_64"),
+                 ("edit-windows-64-bit", "without KNIME", "Windows-x64"),
+                 ("edit-mac", "without KNIME", "MacOSX")]
     if bundle_type != "academic":
-        download_bundle(driver, bundle_type, "edit-mac", "with KNIME")
+        downloads.append(("edit-mac", "with KNIME", "KNIME_MacOSX"))
+
+    return downloads
+
 
+class FormParser(HTMLParser):
+    """
+    Collects the fields of every form on a page. Hidden fields keep their
+    values and the other fields are recorded by element id, along with the
+    options of select fields, so they can be filled in like a user would.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self._select = None
+        self._option = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self.forms.append({
+                "action": attrs.get("action") or "",
+                "hidden": {},
+                "fields": {}
+            })
+        elif not self.forms:
+            return
+
+        form = self.forms[-1]
+        if tag in ("input", "button", "select") and attrs.get("name"):
+            if attrs.get("type") == "hidden":
+                form["hidden"][attrs["name"]] = attrs.get("value") or ""
+            elif attrs.get("id"):
+                form["fields"][attrs["id"]] = {
+                    "name": attrs["name"],
+                    "value": attrs.get("value") or "",
+                    "options": {}
+                }
+        if tag == "select":
+            self._select = form["fields"].get(attrs.get("id"))
+        elif tag == "option" and self._select is not None:
+            self._option = [attrs.get("value"), ""]
+
+    def handle_data(self, data):
+        if self._option is not None:
+            self._option[1] += data
+
+    def handle_endtag(self, tag):
+        if tag == "option" and self._option is not None:
+            value, text = self._option
+            text = text.strip()
+            self._select["options"][text] = text if value is None else value
+            self._option = None
+        elif tag == "select":
+            self._select = None
+
+
+def submit_form(session, page_url, element_id, values, stream=False):
+    """
+    Fetches a page and submits the form containing the given element, as if
+    a user had filled it in.
+
+    :param session: session the form is submitted with
+    :type session: class `requests.Session`
+
+    :param page_url: URL of the page with the form
+    :type page_url: str
+
+    :param element_id: id of an element in the form to submit
+    :type element_id: str
+
+    :param values: value for each element id to fill in. Select fields take
+        the visible text of an option, and None clicks or checks the element
+    :type values: dict
+
+    :return resp: response to the form submission
+    :rtype resp: class `requests.Response`
+    """
+    page = session.get(page_url)
+    page.raise_for_status()
+    parser = FormParser()
+    parser.feed(page.text)
+    form = next(
+        (form for form in parser.forms if element_id in form["fields"]),
+        None)
+    if form is None:
+        raise RuntimeError(f"No form with {element_id} found on {page_url}")
+
+    data = dict(form["hidden"])
+    for field_id, value in values.items():
+        field = form["fields"].get(field_id)
+        if field is None:
+            raise RuntimeError(f"{field_id} not found on {page_url}")
+        if value is None:
+            value = field["value"]
+        elif field["options"]:
+            if value not in field["options"]:
+                raise RuntimeError(f"{value} is not an option of {field_id}")
+            value = field["options"][value]
+        data[field["name"]] = value
+
+    resp = session.post(
+        urljoin(page.url, form["action"]), data=data, stream=stream)
+    resp.raise_for_status()
+    return resp
+
+
+def login_direct(bundle_type):
+    """
+    Logs in to the download page with requests, without a browser.
 
-def download_bundle(driver, bundle_type, element_id, mac_version):
+    :return login_session: session holding the login cookies
+    :rtype login_session: class `requests.Session`
+    """
+    page_url = ACADEMIC_URL if bundle_type == "academic" else URL
+
+    login_session = requests.Session()
+    submit_form(
+        login_session, page_url, "edit-name", {
+            "edit-name": LOGIN_CREDENTIALS[bundle_type]["user"],
+            "edit-pass": LOGIN_CREDENTIALS[bundle_type]["pass"],
+            "edit-submit": None
+        })
+
+    return login_session
+
+
+def download_all_bundles_direct(login_session, bundle_type, release,
+                                download_dir, algorithm):
+    """
+    Submits the download form for every bundle with requests, without a
+    browser. The bundles are downloaded concurrently and hashed as they are
+    written.
+
+    :param login_session: session returned by login_direct()
+    :type login_session: class `requests.Session`
+
+    :return bundle_checksums: checksum of each downloaded bundle
+    :rtype bundle_checksums: dict
+    """
+    page_url = ACADEMIC_URL if bundle_type == "academic" else URL
+
+    def download_one(download):
+        element_id, mac_version, platform = download
+        values = {element_id: None, "edit-eula": None, "edit-submit": None}
+        if bundle_type == "academic":
+            values["edit-freemaestro-acknowledge"] = None
+        else:
+            values["edit-release"] = f"Release 20{release}"
+            values["edit-mac-downloads"] = mac_version
+
+        session = requests.Session()
+        session.cookies = login_session.cookies.copy()
+        resp = submit_form(
+            session, page_url, "edit-eula", values, stream=True)
+        with resp:
+            if not is_bundle(resp):
+                raise RuntimeError(
+                    f"Download form for {platform} did not return a bundle")
+            bundle = get_bundle_name(bundle_type, platform, release)
+            return bundle, write_and_checksum(
+                resp, os.path.join(download_dir, bundle), algorithm)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        return dict(
+            executor.map(download_one, get_bundle_downloads(bundle_type)))
+
+
+def download_all_bundles(driver, bundle_type, release, download_dir):
+    """
+    Submits the download form for every bundle.
+
+    :return download_urls: direct URL of each bundle in the same order as
+        download_files_builder(), or None where chrome kept the download
+    :rtype download_urls: list
+    """
+    download_urls = []
+    for element_id, mac_version, platform in get_bundle_downloads(bundle_type):
+        bundle_path = os.path.join(
+            download_dir, get_bundle_name(bundle_type, platform, release))
+        download_urls.append(
+            download_bundle(driver, bundle_type, element_id, mac_version,
+                            bundle_path))
+
+    return download_urls
+
+
+def download_bundle(driver, bundle_type, element_id, mac_version,
+                    bundle_path):
+    """
+    Submits the download form for a bundle and takes over the download
+    from chrome.
+
+    :param bundle_path: path chrome downloads the bundle to
+    :type bundle_path: str
+
+    :return url: direct URL of the bundle, or None if chrome kept the
+        download
+    :rtype url: str
+    """
     driver.refresh()
-    driver.find_element_by_id(element_id).click()
+    WebDriverWait(driver, PAGE_TIMEOUT).until(
+        EC.element_to_be_clickable((By.ID, element_id))).click()
 
     if bundle_type == "academic":
         driver.find_element_by_id("edit-freemaestro-acknowledge").click()
@@ -126,11 +403,175 @@ def download_bundle(driver, bundle_type, element_id, mac_version):
     driver.find_element_by_id("edit-eula").click()
     driver.find_element_by_id("edit-submit").click()
 
-    #TODO: replace time.sleep() with a function that can verify
-    # the download has started through scraping chrome's download tab
-    time.sleep(10)
+    url = get_download_url(driver, os.path.basename(bundle_path))
+    if not url:
+        # chrome kept the download, make sure it's underway before leaving
+        # the page. Its completion is reported by wait_for_downloads()
+        wait_for_download_start(bundle_path)
     driver.execute_script("window.history.go(-1)")
 
+    return url
+
+
+def wait_for_download_start(bundle_path, timeout=60):
+    """
+    Waits for chrome to start writing a bundle, which it does to a
+    .crdownload file until the download completes.
+
+    :param bundle_path: path chrome downloads the bundle to
+    :type bundle_path: str
+
+    :param timeout: seconds to wait for the download to start
+    :type timeout: int
+
+    :return started: whether the download started before the timeout
+    :rtype started: bool
+    """
+    deadline = time.time() + timeout
+    while not (os.path.exists(bundle_path + ".crdownload")
+               or os.path.exists(bundle_path)):
+        if time.time() > deadline:
+            return False
+        time.sleep(0.25)
+
+    return True
+
+
+def get_download_url(driver, bundle, timeout=30):
+    """
+    Waits for chrome to start a download, then cancels chrome's copy so the
+    bundle can be streamed and hashed with requests instead. The download is
+    found through the DevTools events in chrome's performance log.
+
+    :param bundle: file name of the bundle being downloaded
+    :type bundle: str
+
+    :param timeout: seconds to wait for the download to start
+    :type timeout: int
+
+    :return url: direct URL of the download, or None if it couldn't be
+        taken over from chrome
+    :rtype url: str
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            if message["method"] != "Page.downloadWillBegin":
+                continue
+            params = message["params"]
+            # a late download of a previous bundle is left to chrome
+            if params.get("suggestedFilename") != bundle:
+                continue
+            # a GET to the form's endpoint just returns the page again, so
+            # leave those downloads to chrome
+            session = session_from_cookies(
+                driver.get_cookies(),
+                driver.execute_script("return navigator.userAgent"))
+            try:
+                with session.get(params["url"], stream=True) as resp:
+                    if not resp.ok or not is_bundle(resp):
+                        return None
+            except requests.RequestException:
+                return None
+            try:
+                driver.execute_cdp_cmd("Browser.cancelDownload",
+                                       {"guid": params["guid"]})
+            except WebDriverException:
+                # chrome will finish the download itself
+                return None
+            return params["url"]
+        time.sleep(0.5)
+
+    return None
+
+
+def session_from_cookies(cookies, user_agent):
+    """
+    Creates a requests session that shares the logged in browser's cookies
+
+    :param cookies: cookies from the browser's `get_cookies()`
+    :type cookies: list
+
+    :param user_agent: user agent of the browser
+    :type user_agent: str
+
+    :return session: session with the browser's cookies and user agent
+    :rtype session: class `requests.Session`
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = user_agent
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"))
+
+    return session
+
+
+def download_and_checksum(session, url, fname, algorithm):
+    """
+    Downloads a bundle and calculates its checksum as it's written, so
+    the bundle doesn't have to be read back from disk
+
+    :param url: direct URL of the bundle
+    :type url: str
+
+    :param fname: file name the bundle is written to
+    :type fname: str
+
+    :param algorithm: hash algorithm, one of CHECKSUM_EXTENSIONS
+    :type algorithm: str
+
+    :return checksum: checksum of the downloaded bundle
+    :rtype checksum: str
+    """
+    with session.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        if not is_bundle(resp):
+            raise RuntimeError(f"{url} did not return a bundle")
+        return write_and_checksum(resp, fname, algorithm)
+
+
+def is_bundle(resp):
+    """
+    Checks that a response is a bundle rather than an HTML page
+
+    :param resp: response to a bundle download
+    :type resp: class `requests.Response`
+
+    :return is_bundle: whether the response isn't HTML
+    :rtype is_bundle: bool
+    """
+    return "text/html" not in resp.headers.get("Content-Type", "")
+
+
+def write_and_checksum(resp, fname, algorithm):
+    """
+    Writes a streamed response to a file and calculates its checksum as
+    it's written
+
+    :param resp: streamed response with the bundle
+    :type resp: class `requests.Response`
+
+    :param fname: file name the bundle is written to
+    :type fname: str
+
+    :param algorithm: hash algorithm, one of CHECKSUM_EXTENSIONS
+    :type algorithm: str
+
+    :return checksum: checksum of the downloaded bundle
+    :rtype checksum: str
+    """
+    hash_ = new_hash(algorithm)
+    with open(fname, "wb") as f:
+        for chunk in resp.iter_content(CHECKSUM_CHUNK):
+            f.write(chunk)
+            hash_.update(chunk)
+    return hash_.hexdigest()
+
 
 def download_files_builder(bundle_type, release):
     """
@@ -146,12 +587,10 @@ def download_files_builder(bundle_type, release):
     :rtype download_files: list
     """
 
-    download_files = []
-    for platform in ["Linux-x86_64", "Windows-x64", "MacOSX"]:
-        download_files.append(get_bundle_name(bundle_type, platform, release))
-    if bundle_type != "academic":
-        download_files.append(
-            get_bundle_name(bundle_type, "KNIME_MacOSX", release))
+    download_files = [
+        get_bundle_name(bundle_type, platform, release)
+        for platform in PLATFORMS[bundle_type]
+    ]
 
     return download_files
 
@@ -166,47 +605,150 @@ def get_bundle_name(bundle_type, platform, release):
     :return bundle_name: name of bundle
     :rtype bundle_name: str
     """
-    prefix = ""
-    midfix = ""
-    suffix = ""
-
-    if bundle_type == "academic":
-        prefix = "Maestro"
-        suffix = "_Academic"
-    else:
-        prefix = "Schrodinger_Suites"
-        if bundle_type == "advanced":
-            midfix = "_Advanced"
-
-    if platform == "Linux-x86_64":
-        ext = ".tar"
-    elif platform == "Windows-x64":
-        ext = ".zip"
-    else:
-        ext = ".dmg"
-
-    bundle_name = f"{prefix}_20{release}{midfix}_{platform}{suffix}{ext}"
+    bundle_name = _NAME_TMPL[(bundle_type, platform)].format(rel=release)
 
     return bundle_name
 
 
-def get_ref_checksum(release, build_id, bundle):
+def get_ref_checksum(session, release, build_id, bundle, algorithm):
     """
     Obtains the reference checksum of the given build_id
 
+    :param session: session shared between reference checksum requests
+    :type session: class `requests.Session`
+
+    :param algorithm: hash algorithm, one of CHECKSUM_EXTENSIONS
+    :type algorithm: str
+
     :param build_id: NB build id (eg 142)
     :type build_id: str
 
     :return resp.text: the checksum and the path of the file it was derived from
     :rtype resp.text: str
     """
-    url = f"http://build-download.schrodinger.com/NB/20{release}/build-{build_id}/{bundle}.md5"
-    resp = requests.get(url, stream=True)
+    url = f"http://build-download.schrodinger.com/NB/20{release}/build-{build_id}/{bundle}{CHECKSUM_EXTENSIONS[algorithm]}"
+    cache_path = os.path.join(CACHE_DIR,
+                              hashlib.sha1(url.encode()).hexdigest() + ".json")
+    cached = read_cache(cache_path)
+    if cached and time.time() - cached["fetched_at"] < CACHE_TTL:
+        return cached["text"]
+
+    # Revalidate a stale cache entry instead of downloading it again
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    resp = session.get(url, headers=headers)
+    if cached and resp.status_code == 304:
+        cached["fetched_at"] = time.time()
+        write_cache(cache_path, cached)
+        return cached["text"]
     resp.raise_for_status()
+
+    write_cache(
+        cache_path, {
+            "text": resp.text,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": time.time()
+        })
     return resp.text
 
 
-def input_ref_checksum(prompt):
+def get_references(release, build_id, download_files, algorithm):
+    """
+    Fetches the reference checksum and size of every bundle concurrently
+    over a shared pool of connections.
+
+    :return checksum_references: reference checksum of each bundle
+    :rtype checksum_references: dict
+    :return ref_sizes: reference size in bytes of each bundle
+    :rtype ref_sizes: dict
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("http://", adapter)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        checksum_references = dict(
+            zip(download_files,
+                executor.map(
+                    lambda bundle: get_ref_checksum(
+                        session, release, build_id, bundle, algorithm),
+                    download_files)))
+        # Sizes of the reference bundles let incomplete downloads be
+        # caught without hashing them
+        ref_sizes = dict(
+            zip(download_files,
+                executor.map(
+                    lambda bundle: get_ref_size(
+                        session, release, build_id, bundle),
+                    download_files)))
+
+    return checksum_references, ref_sizes
+
+
+def get_ref_size(session, release, build_id, bundle):
+    """
+    Obtains the size of the reference bundle of the given build_id
+
+    :param session: session shared between reference requests
+    :type session: class `requests.Session`
+
+    :param build_id: NB build id (eg 142)
+    :type build_id: str
+
+    :return size: size of the bundle in bytes, or None if it's unknown
+    :rtype size: int
+    """
+    url = f"http://build-download.schrodinger.com/NB/20{release}/build-{build_id}/{bundle}"
+    try:
+        resp = session.head(url, allow_redirects=True)
+        resp.raise_for_status()
+        return int(resp.headers["Content-Length"])
+    except (requests.RequestException, KeyError, ValueError):
+        return None
+
+
+def read_cache(cache_path):
+    """
+    Reads a cached response
+
+    :param cache_path: path to the cache entry
+    :type cache_path: str
+
+    :return cached: the cached response, or None if there isn't one or it's
+        malformed
+    :rtype cached: dict
+    """
+    try:
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+        if (isinstance(cached["fetched_at"], (int, float))
+                and isinstance(cached["text"], str)):
+            return cached
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def write_cache(cache_path, cached):
+    """
+    Writes a response to the cache
+
+    :param cache_path: path to the cache entry
+    :type cache_path: str
+
+    :param cached: the response text, validators, and time it was fetched
+    :type cached: dict
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(cached, f)
+
+
+def input_ref_checksum(prompt, algorithm):
     """
     Custom input function for when -manual is selected
     If the checksum given is not in proper format, the user
@@ -215,12 +757,16 @@ def input_ref_checksum(prompt):
     :param prompt: prompt to display when asking for checksum
     :type prompt: str
 
+    :param algorithm: hash algorithm, one of CHECKSUM_EXTENSIONS
+    :type algorithm: str
+
     :return checksum: checksum given by user
     :rtype checksum: str
     """
+    checksum_length = len(new_hash(algorithm).hexdigest())
     while True:
         checksum = input(prompt)
-        if len(checksum) != 32 or not checksum.isalnum():
+        if len(checksum) != checksum_length or not checksum.isalnum():
             logger.info(f"Improper checksum format given\nPlease try again")
             continue
         else:
@@ -229,21 +775,78 @@ def input_ref_checksum(prompt):
     return checksum
 
 
-def md5(fname):
+def new_hash(algorithm):
+    """
+    Creates a hash object. The checksums only verify the integrity of the
+    downloads, so md5 is flagged as not being used for security.
+
+    :param algorithm: hash algorithm, one of CHECKSUM_EXTENSIONS
+    :type algorithm: str
+
+    :return hash_: new hash object
+    :rtype hash_: class `hashlib.md5` or `blake3.blake3`
     """
-    Calculate the md5checksum
+    if algorithm == "blake3":
+        import blake3
+        return blake3.blake3()
+
+    try:
+        return hashlib.new("md5", usedforsecurity=False)
+    except TypeError:
+        # usedforsecurity was added in python 3.9
+        return hashlib.md5()
+
+
+def calculate_checksum(fname, algorithm):
+    """
+    Calculate the checksum
 
     :param fname: file name from which the checksum is calculated
     :type fname: str
 
-    :return checksum: md5checksum calculated from bundles
-    :rtype checksum: class `hashlib.md5`
+    :param algorithm: hash algorithm, one of CHECKSUM_EXTENSIONS
+    :type algorithm: str
+
+    :return checksum: checksum calculated from bundles
+    :rtype checksum: str
     """
-    hash_md5 = hashlib.md5()
-    with open(fname, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+    # Small enough bundles are mapped into memory and hashed in one call
+    if 0 < os.path.getsize(fname) <= MMAP_MAX_SIZE:
+        try:
+            with open(fname, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hash_ = new_hash(algorithm)
+                hash_.update(mm)
+                return hash_.hexdigest()
+        except (MemoryError, OSError):
+            pass
+
+    # Read the file on a separate thread so reading and hashing overlap
+    chunks = queue.Queue(maxsize=8)
+
+    def reader():
+        try:
+            with open(fname, "rb", buffering=0) as f:
+                for chunk in iter(lambda: f.read(CHECKSUM_CHUNK), b""):
+                    chunks.put(chunk)
+        except BaseException as err:
+            chunks.put(err)
+        finally:
+            chunks.put(None)
+
+    read_thread = threading.Thread(target=reader, daemon=True)
+    read_thread.start()
+
+    hash_ = new_hash(algorithm)
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            break
+        if isinstance(chunk, BaseException):
+            raise chunk
+        hash_.update(chunk)
+    read_thread.join()
+    return hash_.hexdigest()
 
 
 def remove_installers(download_dir, files_to_remove):
@@ -256,73 +859,138 @@ def remove_installers(download_dir, files_to_remove):
     :param list files_to_remove: name of bundles to remove
     :type list files_to_remove: list
     """
-    for fname in files_to_remove:
-        file_to_delete = os.path.join(download_dir, fname)
-        if os.path.isfile(file_to_delete):
-            os.remove(file_to_delete)
+    # One pass over the directory instead of a stat per file
+    targets = set(files_to_remove)
+    try:
+        entries = os.scandir(download_dir)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name in targets and entry.is_file(follow_symlinks=False):
+                os.remove(entry.path)
 
 
-def main(*, bundle_type, release, build_id, manual):
-    download_dir = os.path.join(os.path.expanduser("~"), "Downloads")
-    download_files = download_files_builder(bundle_type, release)
+class DownloadHandler(FileSystemEventHandler):
+    """
+    Sets the event of each expected file once it appears. Chrome writes to a
+    .crdownload file and renames it when the download completes, so moves
+    are watched as well as creations.
+    """
 
-    # Logger configuration
-    date_format = '%Y-%m-%d %H:%M:%S'
-    logger_format = '%(message)s'
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
 
-    logger = logging.getLogger(os.path.basename(__file__))
+    def _file_appeared(self, path):
+        event = self.events.get(os.path.basename(path))
+        if event:
+            event.set()
 
-    s_handler = logging.StreamHandler()
-    f_handler = logging.FileHandler(f'{release}_dltest_report.log')
-    s_handler.setLevel(logging.INFO)
-    f_handler.setLevel(logging.INFO)
-    logger.addHandler(s_handler)
-    logger.addHandler(f_handler)
-    logger.setLevel(logging.INFO)
-    logger.propagate = False
+    def on_created(self, event):
+        self._file_appeared(event.src_path)
 
-    # Retrieve reference checksums depending on if -build_id or -manual is enabled
-    if manual:
-        checksum_references = {
-            bundle: input_ref_checksum(
-                f"Please enter reference checksum for {bundle}\n")
-            for (bundle) in download_files
-        }
-    else:
-        checksum_references = {
-            bundle: get_ref_checksum(release, build_id, bundle)
-            for (bundle) in download_files
-        }
+    def on_moved(self, event):
+        self._file_appeared(event.dest_path)
+
+
+def wait_for_downloads(download_dir, files, timeout):
+    """
+    Waits for all files to appear in the download directory
 
-    # Remove any previous installers (of the same release) in user's download folder
-    remove_installers(download_dir, download_files)
+    :param download_dir: User's download directory
+    :type download_dir: str
+
+    :param files: name of bundles being downloaded
+    :type files: list
+
+    :param timeout: seconds to wait for all of the files
+    :type timeout: int
 
-    # Set chrome settings to disable safe browsing
+    :return unfinished: name of bundles that didn't appear before the timeout
+    :rtype unfinished: list
+    """
+    events = {fname: threading.Event() for fname in files}
+    observer = Observer()
+    observer.schedule(DownloadHandler(events), download_dir)
+    observer.start()
+    try:
+        # Catch files that finished before the observer started
+        for fname, event in events.items():
+            if os.path.exists(os.path.join(download_dir, fname)):
+                event.set()
+
+        deadline = time.time() + timeout
+        unfinished = [
+            fname for fname, event in events.items()
+            if not event.wait(max(deadline - time.time(), 0))
+        ]
+    finally:
+        observer.stop()
+        observer.join()
+
+    return unfinished
+
+
+def download_all_bundles_with_chrome(bundle_type, release, download_dir,
+                                     download_files, algorithm,
+                                     before_download=None):
+    """
+    Logs in and submits the download form for every bundle through chrome.
+    Downloads that can be taken over from chrome are streamed concurrently
+    and hashed as they are written.
+
+    :param before_download: called once logged in, before any bundle is
+        downloaded
+    :type before_download: callable
+
+    :return bundle_checksums: checksum of each bundle downloaded outside of
+        chrome
+    :rtype bundle_checksums: dict
+    :return unfinished: name of bundles chrome didn't finish downloading
+    :rtype unfinished: list
+    """
+    # Run chrome headless without images or extensions, and disable safe
+    # browsing
     chromeOptions = webdriver.ChromeOptions()
-    prefs = {'safebrowsing.enabled': 'false'}
+    chromeOptions.add_argument("--headless=new")
+    chromeOptions.add_argument("--disable-gpu")
+    chromeOptions.add_argument("--blink-settings=imagesEnabled=false")
+    chromeOptions.add_argument("--disable-extensions")
+    prefs = {
+        'safebrowsing.enabled': 'false',
+        'profile.managed_default_content_settings.images': 2,
+        'download.default_directory': download_dir
+    }
     chromeOptions.add_experimental_option("prefs", prefs)
 
+    # Record DevTools events so download URLs can be read from the log
+    capabilities = DesiredCapabilities.CHROME.copy()
+    capabilities["goog:loggingPrefs"] = {"performance": "ALL"}
+
     # Start up chrome
     try:
-        driver = webdriver.Chrome(options=chromeOptions)
+        driver = webdriver.Chrome(
+            options=chromeOptions, desired_capabilities=capabilities)
         driver.maximize_window()
         if bundle_type == "academic":
             driver.get(ACADEMIC_URL)
         else:
             driver.get(URL)
     except Exception as err:
-        logger.info(err)
-        raise Exception("Please go to https://chromedriver.chromium.org/downloads and download the proper version of chromedriver to place in your /usr/local/bin")
+        raise Exception("Please go to https://chromedriver.chromium.org/downloads and download the proper version of chromedriver to place in your /usr/local/bin") from err
 
-    # Accept cookies
-    time.sleep(5)
-    driver.find_element_by_id("CybotCookiebotDialogBodyButtonAccept").click()
+    # Accept cookies once the dialog shows up
+    WebDriverWait(driver, PAGE_TIMEOUT).until(
+        EC.element_to_be_clickable(
+            (By.ID, "CybotCookiebotDialogBodyButtonAccept"))).click()
 
     # Login
     user = LOGIN_CREDENTIALS[bundle_type]["user"]
     passwd = LOGIN_CREDENTIALS[bundle_type]["pass"]
 
-    username_field = driver.find_element_by_id("edit-name")
+    username_field = WebDriverWait(driver, PAGE_TIMEOUT).until(
+        EC.presence_of_element_located((By.ID, "edit-name")))
     password_field = driver.find_element_by_id("edit-pass")
     username_field.send_keys(user)
     password_field.send_keys(passwd)
@@ -332,38 +1000,176 @@ def main(*, bundle_type, release, build_id, manual):
     if bundle_type == "academic":
         pass
     else:
-        release_dropdown = Select(driver.find_element_by_id("edit-release"))
+        release_dropdown = Select(
+            WebDriverWait(driver, PAGE_TIMEOUT).until(
+                EC.presence_of_element_located((By.ID, "edit-release"))))
         release_dropdown.select_by_visible_text(f"Release 20{release}")
 
-    # Download all bundles
-    download_all_bundles(driver, bundle_type, release)
+    if before_download:
+        before_download()
+
+    # Download all bundles concurrently, hashing the ones taken over from
+    # chrome as they are written
+    download_urls = download_all_bundles(driver, bundle_type, release,
+                                         download_dir)
+    cookies = driver.get_cookies()
+    user_agent = driver.execute_script("return navigator.userAgent")
+
+    def download_one(bundle_and_url):
+        bundle, url = bundle_and_url
+        session = session_from_cookies(cookies, user_agent)
+        return download_and_checksum(session, url,
+                                     os.path.join(download_dir, bundle),
+                                     algorithm)
+
+    direct_downloads = [(bundle, url)
+                        for bundle, url in zip(download_files, download_urls)
+                        if url]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        bundle_checksums = dict(
+            zip([bundle for bundle, _ in direct_downloads],
+                executor.map(download_one, direct_downloads)))
 
     # Wait for all downloads to complete with a timeout of 2 hours
-    timeout = time.time() + TIMEOUT
-    for fname in download_files:
-        while not os.path.exists(os.path.join(download_dir, fname)):
-            time.sleep(1)
-            if time.time() > timeout:
+    unfinished = wait_for_downloads(download_dir, download_files, TIMEOUT)
+
+    driver.quit()
+
+    return bundle_checksums, unfinished
+
+
+def _configure_logging(release):
+    """
+    Attaches the console and report file handlers to the logger. Handlers
+    are only added once so calling main() again doesn't duplicate them.
+
+    :param release: release version, used to name the report file
+    :type release: str
+    """
+    if logger.handlers:
+        return
+
+    s_handler = logging.StreamHandler()
+    f_handler = logging.FileHandler(f'{release}_dltest_report.log')
+    s_handler.setLevel(logging.INFO)
+    f_handler.setLevel(logging.INFO)
+    # Buffer the report so it's written in one go at exit rather than
+    # line by line
+    m_handler = logging.handlers.MemoryHandler(
+        capacity=1024, target=f_handler, flushLevel=logging.ERROR)
+    m_handler.setLevel(logging.INFO)
+    logger.addHandler(s_handler)
+    logger.addHandler(m_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def main(*, bundle_type, release, build_id, manual, algorithm="md5"):
+    download_dir = os.path.join(os.path.expanduser("~"), "Downloads")
+    download_files = download_files_builder(bundle_type, release)
+
+    _configure_logging(release)
+
+    # Retrieve reference checksums depending on if -build_id or -manual is enabled
+    ref_sizes = {}
+    if manual:
+        checksum_references = {
+            bundle: input_ref_checksum(
+                f"Please enter reference checksum for {bundle}\n", algorithm)
+            for (bundle) in download_files
+        }
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ref_executor:
+        # Fetch the references in the background while logging in. They're
+        # collected before any bundle is downloaded, so a bad build id fails
+        # the run before the downloads start
+        if not manual:
+            references = ref_executor.submit(get_references, release,
+                                             build_id, download_files,
+                                             algorithm)
+
+        def wait_for_references():
+            if not manual:
+                references.result()
+
+        # Remove any previous installers (of the same release) in user's download folder
+        remove_installers(download_dir, download_files)
+
+        # Download all bundles straight from the download form, falling back
+        # to going through it with chrome if the form can't be submitted
+        # directly
+        bundle_checksums = None
+        try:
+            login_session = login_direct(bundle_type)
+        except (RuntimeError, requests.RequestException) as err:
+            fallback_reason = err
+        else:
+            wait_for_references()
+            try:
+                bundle_checksums = download_all_bundles_direct(
+                    login_session, bundle_type, release, download_dir,
+                    algorithm)
+            except (RuntimeError, requests.RequestException) as err:
+                fallback_reason = err
+
+        if bundle_checksums is None:
+            logger.info(
+                f"Direct download failed, falling back to chrome: {fallback_reason}"
+            )
+            remove_installers(download_dir, download_files)
+            bundle_checksums, unfinished = download_all_bundles_with_chrome(
+                bundle_type, release, download_dir, download_files,
+                algorithm, before_download=wait_for_references)
+            for fname in unfinished:
                 logger.info(
-                    f"{fname} download unfinished due to the timeout being met (timeout = {timeout}s) "
+                    f"{fname} download unfinished due to the timeout being met (timeout = {TIMEOUT}s) "
                 )
-                break
 
-    driver.quit()
+        if not manual:
+            checksum_references, ref_sizes = references.result()
+
+    # Skip hashing bundles chrome downloaded that aren't the reference size
+    for bundle in download_files:
+        bundle_path = os.path.join(download_dir, bundle)
+        if bundle in bundle_checksums or not ref_sizes.get(bundle):
+            continue
+        size = os.path.getsize(bundle_path) if os.path.exists(
+            bundle_path) else None
+        if size != ref_sizes[bundle]:
+            logger.info(
+                f"{bundle} is {size} bytes, expected {ref_sizes[bundle]} bytes. Skipping checksum"
+            )
+            bundle_checksums[bundle] = None
+
+    # Calculate checksums of the bundles chrome downloaded concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            bundle: executor.submit(calculate_checksum,
+                                    os.path.join(download_dir, bundle),
+                                    algorithm)
+            for bundle in download_files if bundle not in bundle_checksums
+        }
+        bundle_checksums.update({
+            bundle: future.result()
+            for bundle, future in futures.items()
+        })
 
-    # Calculate, compare, and report checksums
-    logger.info(bundle_type.capitalize() + " md5checksums\n")
+    # Compare and report checksums
+    logger.info(bundle_type.capitalize() + f" {algorithm} checksums\n")
     for bundle in download_files:
         bundle_path = os.path.join(download_dir, bundle)
-        bundle_checksum = md5(bundle_path)
+        bundle_checksum = bundle_checksums[bundle]
         ref_checksum = checksum_references[bundle]
         platforms = [f"{release}_Linux", f"{release}_Windows", f"{release}_MacOSX", f"{release}_KNIME_MacOSX"]
-        [logger.info(platform[5:]) for platform in platforms if platform in bundle]
+        for platform in platforms:
+            if platform in bundle:
+                logger.info(platform[5:])
         logger.info(
             f"REFERENCE: {ref_checksum}\nDOWNLOADED: {bundle_checksum} {bundle_path}"
         )
 
-        if bundle_checksum == ref_checksum[:32]:
+        if bundle_checksum and bundle_checksum == ref_checksum[:len(
+                bundle_checksum)]:
             logger.info("congrats, both checksums match!\n\n")
         else:
             logger.info("checksums DO NOT match\n\n")
@@ -376,4 +1182,5 @@ if __name__ == '__main__':
         bundle_type=cmd_args.bundle_type,
         release=cmd_args.release,
         build_id=cmd_args.build_id,
-        manual=cmd_args.manual)
+        manual=cmd_args.manual,
+        algorithm=cmd_args.hash)
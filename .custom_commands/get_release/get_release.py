@@ -1,35 +1,46 @@
 import datetime as DT
+import functools
+import json
 import os
 import pickle
+import time
 from pathlib import Path
 
 HOME = str(Path.home())
 
-def get_current_release():
+# The release only changes quarterly, so it's cached for a week
+CACHE_PATH = os.path.join(HOME, ".cache/get_release/current")
+CACHE_TTL = 7 * 86400
+
+SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
+TOKEN_PATH = Path(HOME, ".custom_commands/get_release/token.json")
+# Tokens used to be pickled, they're converted to JSON the first time
+PICKLE_TOKEN_PATH = TOKEN_PATH.with_suffix(".pickle")
+
+
+@functools.lru_cache(maxsize=1)
+def get_creds():
     """
-    Gets the current release version by looking 15 weeks ahead
-    from the time of execution into the build & release calendar
-    and examining the next release target.
+    Loads the google credentials from the token file, refreshing them or
+    running the login flow if needed, and saves them back as JSON.
 
-    :return current_release: Current release in XXXX-X format
-    :rtype current_release: str
+    :return creds: Credentials for the calendar API
+    :rtype creds: google.oauth2.credentials.Credentials
     """
 
-    from googleapiclient.discovery import build
+    from google.oauth2.credentials import Credentials
     from google_auth_oauthlib.flow import InstalledAppFlow
     from google.auth.transport.requests import Request
 
-    SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
-    QA_calendar_id = "schrodinger.com_cl2hf12t7dim7s894gda2l9pa0@group.calendar.google.com"
     creds = None
 
-    token_path = os.path.join(HOME, ".custom_commands/get_release/token.pickle")
-
-
     # Token
-    if os.path.exists(token_path):
-        with open(token_path, 'rb') as token:
-            creds = pickle.load(token)
+    if not TOKEN_PATH.exists() and PICKLE_TOKEN_PATH.exists():
+        with open(PICKLE_TOKEN_PATH, 'rb') as token:
+            TOKEN_PATH.write_text(pickle.load(token).to_json())
+    if TOKEN_PATH.exists():
+        creds = Credentials.from_authorized_user_info(
+            json.loads(TOKEN_PATH.read_text()), SCOPES)
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -44,11 +55,37 @@ def get_current_release():
                 'credentials.json', SCOPES)
             creds = flow.run_local_server(port=0)
         # Save the credentials for the next run
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+        TOKEN_PATH.write_text(creds.to_json())
+
+    return creds
+
+
+def get_current_release():
+    """
+    Gets the current release version by looking 15 weeks ahead
+    from the time of execution into the build & release calendar
+    and examining the next release target.
+
+    :return current_release: Current release in XXXX-X format
+    :rtype current_release: str
+    """
+
+    # Use the cached release if it's fresh enough
+    try:
+        with open(CACHE_PATH, 'r') as cache:
+            cached = json.load(cache)
+        if time.time() - cached["ts"] < CACHE_TTL:
+            print(cached["release"])
+            return
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    from googleapiclient.discovery import build
+
+    QA_calendar_id = "schrodinger.com_cl2hf12t7dim7s894gda2l9pa0@group.calendar.google.com"
 
     # Start google calendar
-    service = build('calendar', 'v3', credentials=creds)
+    service = build('calendar', 'v3', credentials=get_creds())
 
     # Times for events().list()
     now = DT.datetime.now().isoformat() + 'Z'  # 'Z' indicates UTC time
@@ -70,6 +107,12 @@ def get_current_release():
         logger.info("No release targets detected")
         return False
 
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, 'w') as cache:
+        json.dump({"release": current_release, "ts": time.time()}, cache)
+
     print(current_release)
 
-get_current_release()
\ No newline at end of file
+
+if __name__ == "__main__":
+    get_current_release()